@@ -37,6 +37,15 @@ design_models, prediction_models, multimer_validation = load_af2_models(advanced
 bindcraft_folder = os.path.dirname(os.path.realpath(__file__))
 advanced_settings = perform_advanced_settings_check(advanced_settings, bindcraft_folder)
 
+### optional on-disk JAX compilation cache
+# AF2 graphs are recompiled whenever the binder length changes; with thousands
+# of trajectories the same lengths recur, so caching compiled executables on
+# disk turns those recompilations (and all compilations after a restart) into
+# cache hits
+if advanced_settings.get("jax_compilation_cache_dir"):
+    jax.config.update("jax_compilation_cache_dir", advanced_settings["jax_compilation_cache_dir"])
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", 1.0)
+
 ### generate directories, design path names can be found within the function
 design_paths = generate_directories(target_settings["design_path"])
 
@@ -57,7 +66,13 @@ generate_filter_pass_csv(failure_csv, args.filters)
 ####################################
 ####################################
 ### initialise PyRosetta
-pr.init(f'-ignore_unrecognized_res -ignore_zero_occupancy -mute all -holes:dalphaball {advanced_settings["dalphaball_path"]} -corrections::beta_nov16 true -relax:default_repeats 1')
+pyrosetta_flags = f'-ignore_unrecognized_res -ignore_zero_occupancy -mute all -holes:dalphaball {advanced_settings["dalphaball_path"]} -corrections::beta_nov16 true -relax:default_repeats 1'
+pr.init(pyrosetta_flags)
+
+# shared pool of pre-initialised PyRosetta worker processes, so the CPU-bound
+# relax and scoring calls overlap with the GPU-bound main loop
+start_pyrosetta_pool(pyrosetta_flags, advanced_settings.get("relax_workers", 2))
+
 print(f"Running binder design for target {settings_file}")
 print(f"Design settings used: {advanced_file}")
 print(f"Filtering designs based on {filters_file}")
@@ -68,6 +83,23 @@ script_start_time = time.time()
 trajectory_n = 1
 accepted_designs = 0
 
+# single modern Generator for seed and length sampling, drawing scalars
+# directly instead of allocating arrays through the legacy RandomState
+rng = np.random.default_rng()
+
+# hoist values that never change between trajectories out of the design loop
+binder_name = target_settings["binder_name"]
+min_binder_length = min(target_settings["lengths"])
+max_binder_length = max(target_settings["lengths"])
+
+# index existing trajectory PDBs once, set membership replaces four stat()
+# calls per loop iteration
+trajectory_dirs = ["Trajectory", "Trajectory/Relaxed", "Trajectory/LowConfidence", "Trajectory/Clashing"]
+existing_trajectories = set()
+for trajectory_dir in trajectory_dirs:
+    with os.scandir(design_paths[trajectory_dir]) as entries:
+        existing_trajectories.update(entry.name for entry in entries if entry.name.endswith('.pdb'))
+
 ### start design loop
 while True:
     ### check if we have the target number of binders
@@ -88,21 +120,24 @@ while True:
     trajectory_start_time = time.time()
 
     # generate random seed to vary designs
-    seed = int(np.random.randint(0, high=999999, size=1, dtype=int)[0])
+    seed = int(rng.integers(0, 999999))
 
     # sample binder design length randomly from defined distribution
-    samples = np.arange(min(target_settings["lengths"]), max(target_settings["lengths"]) + 1)
-    length = np.random.choice(samples)
+    length = int(rng.integers(min_binder_length, max_binder_length + 1))
 
     # load desired helicity value to sample different secondary structure contents
     helicity_value = load_helicity(advanced_settings)
 
     # generate design name and check if same trajectory was already run
-    design_name = target_settings["binder_name"] + "_l" + str(length) + "_s"+ str(seed)
-    trajectory_dirs = ["Trajectory", "Trajectory/Relaxed", "Trajectory/LowConfidence", "Trajectory/Clashing"]
-    trajectory_exists = any(os.path.exists(os.path.join(design_paths[trajectory_dir], design_name + ".pdb")) for trajectory_dir in trajectory_dirs)
+    design_name = binder_name + "_l" + str(length) + "_s"+ str(seed)
+    trajectory_pdb_name = design_name + ".pdb"
+    # on a set miss, confirm against all trajectory folders on disk so designs
+    # written, moved or cleaned up by sibling processes after startup are
+    # still skipped
+    trajectory_exists = trajectory_pdb_name in existing_trajectories or any(os.path.exists(os.path.join(design_paths[trajectory_dir], trajectory_pdb_name)) for trajectory_dir in trajectory_dirs)
 
     if not trajectory_exists:
+        existing_trajectories.add(trajectory_pdb_name)
         print("Starting trajectory: "+design_name)
 
         ### Begin binder hallucination
@@ -123,32 +158,44 @@ while True:
 
         # Proceed if there is no trajectory termination signal
         if trajectory.aux["log"]["terminate"] == "":
-            # Relax binder to calculate statistics
+            # Relax binder to calculate statistics, in the background so the
+            # unrelaxed analyses below overlap with the PyRosetta CPU work
             trajectory_relaxed = os.path.join(design_paths["Trajectory/Relaxed"], design_name + ".pdb")
-            pr_relax(trajectory_pdb, trajectory_relaxed)
+            relax_future = relax_async(trajectory_pdb, trajectory_relaxed)
 
             # define binder chain, placeholder in case multi-chain parsing in ColabDesign gets changed
             binder_chain = "B"
 
-            # Calculate clashes before and after relaxation
+            # Calculate clashes before relaxation
             num_clashes_trajectory = calculate_clash_score(trajectory_pdb)
-            num_clashes_relaxed = calculate_clash_score(trajectory_relaxed)
 
             # secondary structure content of starting trajectory binder and interface
-            trajectory_alpha, trajectory_beta, trajectory_loops, trajectory_alpha_interface, trajectory_beta_interface, trajectory_loops_interface, trajectory_i_plddt, trajectory_ss_plddt = calc_ss_percentage(trajectory_pdb, advanced_settings, binder_chain)
-
-            # analyze interface scores for relaxed af2 trajectory
-            trajectory_interface_scores, trajectory_interface_AA, trajectory_interface_residues = score_interface(trajectory_relaxed, binder_chain)
+            # skip the DSSP pass if the unrelaxed trajectory gets discarded anyway,
+            # unless trajectory_beta steers the optimise_beta branch below
+            if (not advanced_settings["remove_unrelaxed_trajectory"] or advanced_settings.get("ss_unrelaxed", False)
+                    or (advanced_settings["enable_mpnn"] and advanced_settings["optimise_beta"])):
+                trajectory_alpha, trajectory_beta, trajectory_loops, trajectory_alpha_interface, trajectory_beta_interface, trajectory_loops_interface, trajectory_i_plddt, trajectory_ss_plddt = calc_ss_percentage(trajectory_pdb, advanced_settings, binder_chain)
+            else:
+                trajectory_alpha = trajectory_beta = trajectory_loops = trajectory_alpha_interface = trajectory_beta_interface = trajectory_loops_interface = trajectory_i_plddt = trajectory_ss_plddt = None
 
             # starting binder sequence
             trajectory_sequence = trajectory.get_seq(get_best=True)[0]
 
-            # analyze sequence
-            traj_seq_notes = validate_design_sequence(trajectory_sequence, num_clashes_relaxed, advanced_settings)
-
             # target structure RMSD compared to input PDB
             trajectory_target_rmsd = target_pdb_rmsd(trajectory_pdb, target_settings["starting_pdb"], target_settings["chains"])
 
+            # join the background relax before the relaxed-structure analyses
+            relax_future.result()
+
+            # Calculate clashes after relaxation
+            num_clashes_relaxed = calculate_clash_score(trajectory_relaxed)
+
+            # analyze interface scores for relaxed af2 trajectory
+            trajectory_interface_scores, trajectory_interface_AA, trajectory_interface_residues = score_interface(trajectory_relaxed, binder_chain)
+
+            # analyze sequence
+            traj_seq_notes = validate_design_sequence(trajectory_sequence, num_clashes_relaxed, advanced_settings)
+
             # save trajectory statistics into CSV
             trajectory_data = [design_name, advanced_settings["design_algorithm"], length, seed, helicity_value, target_settings["target_hotspot_residues"], trajectory_sequence, trajectory_interface_residues, 
                                 trajectory_metrics['plddt'], trajectory_metrics['ptm'], trajectory_metrics['i_ptm'], trajectory_metrics['pae'], trajectory_metrics['i_pae'],
@@ -166,6 +213,7 @@ while True:
                 mpnn_n = 1
                 accepted_mpnn = 0
                 mpnn_dict = {}
+                cleanup_files = []
                 design_start_time = time.time()
 
                 ### MPNN redesign of starting binder
@@ -195,9 +243,12 @@ while True:
 
                     ### Compile prediction models once for faster prediction of MPNN sequences
                     clear_mem()
-                    # compile complex prediction model
-                    complex_prediction_model = mk_afdesign_model(protocol="binder", num_recycles=advanced_settings["num_recycles_validation"], data_dir=advanced_settings["af_params_dir"], 
-                                                                use_multimer=multimer_validation, use_initial_guess=advanced_settings["predict_initial_guess"], use_initial_atom_pos=advanced_settings["predict_bigbang"])
+                    # compile complex prediction model, running inference in bfloat16
+                    # halves activation memory and speeds up prediction on tensor cores;
+                    # gradients are not needed here, unlike during hallucination
+                    complex_prediction_model = mk_afdesign_model(protocol="binder", num_recycles=advanced_settings["num_recycles_validation"], data_dir=advanced_settings["af_params_dir"],
+                                                                use_multimer=multimer_validation, use_initial_guess=advanced_settings["predict_initial_guess"], use_initial_atom_pos=advanced_settings["predict_bigbang"],
+                                                                use_bfloat16=advanced_settings.get("use_bfloat16_prediction", True))
                     if advanced_settings["predict_initial_guess"] or advanced_settings["predict_bigbang"]:
                         complex_prediction_model.prep_inputs(pdb_filename=trajectory_pdb, chain='A', binder_chain='B', binder_len=length, use_binder_template=True, rm_target_seq=advanced_settings["rm_template_seq_predict"],
                                                             rm_target_sc=advanced_settings["rm_template_sc_predict"], rm_template_ic=True)
@@ -206,12 +257,27 @@ while True:
                                                             rm_target_sc=advanced_settings["rm_template_sc_predict"])
 
                     # compile binder monomer prediction model
-                    binder_prediction_model = mk_afdesign_model(protocol="hallucination", use_templates=False, initial_guess=False, 
-                                                                use_initial_atom_pos=False, num_recycles=advanced_settings["num_recycles_validation"], 
-                                                                data_dir=advanced_settings["af_params_dir"], use_multimer=multimer_validation)
+                    binder_prediction_model = mk_afdesign_model(protocol="hallucination", use_templates=False, initial_guess=False,
+                                                                use_initial_atom_pos=False, num_recycles=advanced_settings["num_recycles_validation"],
+                                                                data_dir=advanced_settings["af_params_dir"], use_multimer=multimer_validation,
+                                                                use_bfloat16=advanced_settings.get("use_bfloat16_prediction", True))
                     binder_prediction_model.prep_inputs(length=length)
 
-                    # iterate over designed sequences        
+                    # save all trajectory sequences in one batched FASTA write
+                    if advanced_settings["save_mpnn_fasta"] is True:
+                        save_fasta_batch(design_name, mpnn_sequences, design_paths)
+
+                    # hoist loop-invariant settings out of the per-sequence loop
+                    design_algorithm = advanced_settings["design_algorithm"]
+                    remove_unrelaxed_complex = advanced_settings["remove_unrelaxed_complex"]
+                    remove_binder_monomer = advanced_settings["remove_binder_monomer"]
+                    max_mpnn_sequences = advanced_settings["max_mpnn_sequences"]
+                    save_design_animations = advanced_settings["save_design_animations"]
+                    starting_pdb = target_settings["starting_pdb"]
+                    target_chains = target_settings["chains"]
+                    target_hotspots = target_settings["target_hotspot_residues"]
+
+                    # iterate over designed sequences
                     for mpnn_sequence in mpnn_sequences:
                         mpnn_time = time.time()
 
@@ -223,14 +289,10 @@ while True:
                         # add design to dictionary
                         mpnn_dict[mpnn_design_name] = {'seq': mpnn_sequence['seq'], 'score': mpnn_score, 'seqid': mpnn_seqid}
 
-                        # save fasta sequence
-                        if advanced_settings["save_mpnn_fasta"] is True:
-                            save_fasta(mpnn_design_name, mpnn_sequence['seq'], design_paths)
-                        
                         ### Predict mpnn redesigned binder complex using masked templates
                         mpnn_complex_statistics, pass_af2_filters = predict_binder_complex(complex_prediction_model,
                                                                                         mpnn_sequence['seq'], mpnn_design_name,
-                                                                                        target_settings["starting_pdb"], target_settings["chains"],
+                                                                                        starting_pdb, target_chains,
                                                                                         length, trajectory_pdb, prediction_models, advanced_settings,
                                                                                         filters, design_paths, failure_csv)
 
@@ -260,7 +322,7 @@ while True:
                                 rmsd_site = unaligned_rmsd(trajectory_pdb, mpnn_design_pdb, binder_chain, binder_chain)
 
                                 # calculate RMSD of target compared to input PDB
-                                target_rmsd = target_pdb_rmsd(mpnn_design_pdb, target_settings["starting_pdb"], target_settings["chains"])
+                                target_rmsd = target_pdb_rmsd(mpnn_design_pdb, starting_pdb, target_chains)
 
                                 # add the additional statistics to the mpnn_complex_statistics dictionary
                                 mpnn_complex_statistics[model_num+1].update({
@@ -294,8 +356,8 @@ while True:
                                 })
 
                                 # save space by removing unrelaxed predicted mpnn complex pdb?
-                                if advanced_settings["remove_unrelaxed_complex"]:
-                                    os.remove(mpnn_design_pdb)
+                                if remove_unrelaxed_complex:
+                                    cleanup_files.append(mpnn_design_pdb)
 
                         # calculate complex averages
                         mpnn_complex_averages = calculate_averages(mpnn_complex_statistics, handle_aa=True)
@@ -317,8 +379,8 @@ while True:
                                 })
 
                             # save space by removing binder monomer models?
-                            if advanced_settings["remove_binder_monomer"]:
-                                os.remove(mpnn_binder_pdb)
+                            if remove_binder_monomer:
+                                cleanup_files.append(mpnn_binder_pdb)
 
                         # calculate binder averages
                         binder_averages = calculate_averages(binder_statistics)
@@ -339,7 +401,7 @@ while True:
                                             'Binder_BetaSheet%', 'Binder_Loop%', 'InterfaceAAs', 'Hotspot_RMSD', 'Target_RMSD']
 
                         # Initialize mpnn_data with the non-statistical data
-                        mpnn_data = [mpnn_design_name, advanced_settings["design_algorithm"], length, seed, helicity_value, target_settings["target_hotspot_residues"], mpnn_sequence['seq'], mpnn_interface_residues, mpnn_score, mpnn_seqid]
+                        mpnn_data = [mpnn_design_name, design_algorithm, length, seed, helicity_value, target_hotspots, mpnn_sequence['seq'], mpnn_interface_residues, mpnn_score, mpnn_seqid]
 
                         # Add the statistical data for mpnn_complex
                         for label in statistics_labels:
@@ -376,18 +438,18 @@ while True:
                             accepted_mpnn += 1
                             accepted_designs += 1
                             
-                            # copy designs to accepted folder
-                            shutil.copy(best_model_pdb, design_paths["Accepted"])
+                            # link designs into accepted folder
+                            link_or_copy(best_model_pdb, design_paths["Accepted"])
 
                             # insert data into final csv
                             final_data = [''] + mpnn_data
                             insert_data(final_csv, final_data)
 
                             # copy animation from accepted trajectory
-                            if advanced_settings["save_design_animations"]:
+                            if save_design_animations:
                                 accepted_animation = os.path.join(design_paths["Accepted/Animation"], f"{design_name}.html")
                                 if not os.path.exists(accepted_animation):
-                                    shutil.copy(os.path.join(design_paths["Trajectory/Animation"], f"{design_name}.html"), accepted_animation)
+                                    link_or_copy(os.path.join(design_paths["Trajectory/Animation"], f"{design_name}.html"), accepted_animation)
 
                             # copy plots of accepted trajectory
                             plot_files = os.listdir(design_paths["Trajectory/Plots"])
@@ -396,13 +458,12 @@ while True:
                                 source_plot = os.path.join(design_paths["Trajectory/Plots"], accepted_plot)
                                 target_plot = os.path.join(design_paths["Accepted/Plots"], accepted_plot)
                                 if not os.path.exists(target_plot):
-                                    shutil.copy(source_plot, target_plot)
+                                    link_or_copy(source_plot, target_plot)
 
                         else:
                             print(f"Unmet filter conditions for {mpnn_design_name}")
-                            failure_df = pd.read_csv(failure_csv)
                             special_prefixes = ('Average_', '1_', '2_', '3_', '4_', '5_')
-                            incremented_columns = set()
+                            failed_columns = {}
 
                             for column in filter_conditions:
                                 base_column = column
@@ -410,18 +471,18 @@ while True:
                                     if column.startswith(prefix):
                                         base_column = column.split('_', 1)[1]
 
-                                if base_column not in incremented_columns:
-                                    failure_df[base_column] = failure_df[base_column] + 1
-                                    incremented_columns.add(base_column)
+                                # count each failing base column once per design
+                                failed_columns.setdefault(base_column, 1)
 
-                            failure_df.to_csv(failure_csv, index=False)
-                            shutil.copy(best_model_pdb, design_paths["Rejected"])
+                            # update through the locked failure CSV writer
+                            update_failures(failure_csv, failed_columns)
+                            link_or_copy(best_model_pdb, design_paths["Rejected"])
                         
                         # increase MPNN design number
                         mpnn_n += 1
 
                         # if enough mpnn sequences of the same trajectory pass filters then stop
-                        if accepted_mpnn >= advanced_settings["max_mpnn_sequences"]:
+                        if accepted_mpnn >= max_mpnn_sequences:
                             break
 
                     if accepted_mpnn >= 1:
@@ -435,6 +496,11 @@ while True:
                     print('Duplicate MPNN designs sampled with different trajectory, skipping current trajectory optimisation')
                     print("")
 
+                # drain deferred file deletions in one pass, keeping unlink
+                # syscalls out of the prediction loop
+                for cleanup_file in cleanup_files:
+                    os.remove(cleanup_file)
+
                 # save space by removing unrelaxed design trajectory PDB
                 if advanced_settings["remove_unrelaxed_trajectory"]:
                     os.remove(trajectory_pdb)
@@ -457,6 +523,7 @@ while True:
         gc.collect()
 
 ### Script finished
+shutdown_pyrosetta_pool()
 elapsed_time = time.time() - script_start_time
 elapsed_text = f"{'%d hours, %d minutes, %d seconds' % (int(elapsed_time // 3600), int((elapsed_time % 3600) // 60), int(elapsed_time % 60))}"
 print("Finished all designs. Script execution for "+str(trajectory_n)+" trajectories took: "+elapsed_text)
\ No newline at end of file
@@ -0,0 +1,70 @@
+#!/bin/bash
+# Run one BindCraft process per GPU on a multi-GPU node.
+#
+# The design loop is sequential per process, but trajectories are independent:
+# each process samples its own random seeds and lengths, the trajectory_exists
+# check skips designs already produced by a sibling process, the stats CSVs
+# are opened in append mode, and the rewritten files (failure counts, final
+# rerank) are serialised through lock files, so several processes can safely
+# share one design_path. This gives near-linear scaling with GPU count
+# without any extra dependencies.
+
+# Get the directory where the bindcraft script is located
+SCRIPT_DIR=$(dirname "$0")
+
+# Parsing command line options
+SETTINGS=""
+FILTERS=""
+ADVANCED=""
+GPUS=""
+TEMP=$(getopt -o s:f:a:g: --long settings:,filters:,advanced:,gpus: -n 'bindcraft_multigpu.sh' -- "$@")
+eval set -- "$TEMP"
+
+while true ; do
+    case "$1" in
+        -s|--settings) SETTINGS="$2" ; shift 2 ;;
+        -f|--filters) FILTERS="$2" ; shift 2 ;;
+        -a|--advanced) ADVANCED="$2" ; shift 2 ;;
+        -g|--gpus) GPUS="$2" ; shift 2 ;;
+        --) shift ; break ;;
+        *) echo "Invalid Option" ; exit 1 ;;
+    esac
+done
+
+# Ensure that SETTINGS is not empty
+if [ -z "$SETTINGS" ]; then
+    echo "Error: The -s or --settings option is required."
+    exit 1
+fi
+
+# default to all GPUs visible on the node
+if [ -z "$GPUS" ]; then
+    GPUS=$(nvidia-smi --list-gpus 2>/dev/null | wc -l)
+fi
+if [ "$GPUS" -lt 1 ]; then
+    echo "Error: no GPUs detected, use --gpus to set the number of processes."
+    exit 1
+fi
+
+echo "Running the BindCraft pipeline on $GPUS GPUs"
+PIDS=()
+for ((GPU=0; GPU<GPUS; GPU++)); do
+    CUDA_VISIBLE_DEVICES=$GPU python -u "${SCRIPT_DIR}/bindcraft.py" \
+        --settings "${SETTINGS}" --filters "${FILTERS}" --advanced "${ADVANCED}" \
+        > "bindcraft_gpu${GPU}.log" 2>&1 &
+    PIDS+=($!)
+    echo "Started BindCraft on GPU $GPU (PID ${PIDS[-1]}, log bindcraft_gpu${GPU}.log)"
+done
+
+# wait for all processes and report their exit codes
+FAIL=0
+for PID in "${PIDS[@]}"; do
+    wait "$PID" || FAIL=1
+done
+
+if [ "$FAIL" -eq 0 ]; then
+    echo "All BindCraft processes finished."
+else
+    echo "One or more BindCraft processes exited with an error, check the logs."
+    exit 1
+fi
@@ -9,6 +9,7 @@ import math, random
 import matplotlib.pyplot as plt
 
 from .pyrosetta_utils import *
+from .pyrosetta_pool import *
 from .colabdesign_utils import *
 from .biopython_utils import *
 from .generic_utils import *
@@ -4,8 +4,9 @@
 ### Import dependencies
 import os
 import math
+import functools
 import numpy as np
-from collections import defaultdict
+from collections import Counter, defaultdict
 from scipy.spatial import cKDTree
 from Bio import BiopythonWarning
 from Bio.PDB import PDBParser, DSSP, Selection, Polypeptide, PDBIO, Select, Chain, Superimposer
@@ -21,11 +22,14 @@ def validate_design_sequence(sequence, num_clashes, advanced_settings):
     if num_clashes > 0:
         note_array.append('Relaxed structure contains clashes.')
 
+    # tally the composition in a single pass over the sequence
+    composition = Counter(sequence)
+
     # Check if the sequence contains disallowed amino acids
     if advanced_settings["omit_AAs"]:
         restricted_AAs = advanced_settings["omit_AAs"].split(',')
         for restricted_AA in restricted_AAs:
-            if restricted_AA in sequence:
+            if composition[restricted_AA]:
                 note_array.append('Contains: '+restricted_AA+'!')
 
     # Analyze the protein
@@ -45,17 +49,14 @@ def validate_design_sequence(sequence, num_clashes, advanced_settings):
 
     return notes
 
-# temporary function, calculate RMSD of input PDB and trajectory target
-def target_pdb_rmsd(trajectory_pdb, starting_pdb, chain_ids_string):
-    # Parse the PDB files
+# parse the target chains of the starting PDB once per run, the reference
+# structure never changes between calls so re-parsing it per trajectory and
+# per MPNN design is pure waste
+@functools.lru_cache(maxsize=4)
+def _get_target_residues(starting_pdb, chain_ids_string):
     parser = PDBParser(QUIET=True)
-    structure_trajectory = parser.get_structure('trajectory', trajectory_pdb)
     structure_starting = parser.get_structure('starting', starting_pdb)
-    
-    # Extract chain A from trajectory_pdb
-    chain_trajectory = structure_trajectory[0]['A']
-    
-    # Extract the specified chains from starting_pdb
+
     chain_ids = chain_ids_string.split(',')
     residues_starting = []
     for chain_id in chain_ids:
@@ -64,7 +65,21 @@ def target_pdb_rmsd(trajectory_pdb, starting_pdb, chain_ids_string):
         for residue in chain:
             if is_aa(residue, standard=True):
                 residues_starting.append(residue)
-    
+
+    return residues_starting
+
+# temporary function, calculate RMSD of input PDB and trajectory target
+def target_pdb_rmsd(trajectory_pdb, starting_pdb, chain_ids_string):
+    # Parse the trajectory PDB, the starting PDB residues come from the cache
+    parser = PDBParser(QUIET=True)
+    structure_trajectory = parser.get_structure('trajectory', trajectory_pdb)
+
+    # Extract chain A from trajectory_pdb
+    chain_trajectory = structure_trajectory[0]['A']
+
+    # Extract the specified chains from starting_pdb
+    residues_starting = _get_target_residues(starting_pdb, chain_ids_string)
+
     # Extract residues from chain A in trajectory_pdb
     residues_trajectory = [residue for residue in chain_trajectory if is_aa(residue, standard=True)]
     
@@ -90,7 +105,8 @@ def calculate_clash_score(pdb_file, threshold=2.4, only_ca=False):
     structure = parser.get_structure('protein', pdb_file)
 
     atoms = []
-    atom_info = []  # Detailed atom info for debugging and processing
+    chain_ids = []
+    residue_ids = []
 
     for model in structure:
         for chain in model:
@@ -101,31 +117,34 @@ def calculate_clash_score(pdb_file, threshold=2.4, only_ca=False):
                     if only_ca and atom.get_name() != 'CA':
                         continue
                     atoms.append(atom.coord)
-                    atom_info.append((chain.id, residue.id[1], atom.get_name(), atom.coord))
+                    chain_ids.append(chain.id)
+                    residue_ids.append(residue.id[1])
+
+    chain_ids = np.array(chain_ids)
+    residue_ids = np.array(residue_ids)
 
     tree = cKDTree(atoms)
-    pairs = tree.query_pairs(threshold)
+    pairs = tree.query_pairs(threshold, output_type='ndarray')
 
-    valid_pairs = set()
-    for (i, j) in pairs:
-        chain_i, res_i, name_i, coord_i = atom_info[i]
-        chain_j, res_j, name_j, coord_j = atom_info[j]
+    if len(pairs) == 0:
+        return 0
 
-        # Exclude clashes within the same residue
-        if chain_i == chain_j and res_i == res_j:
-            continue
+    # filter the candidate pairs with boolean masks instead of a Python loop
+    chain_i, chain_j = chain_ids[pairs[:, 0]], chain_ids[pairs[:, 1]]
+    res_i, res_j = residue_ids[pairs[:, 0]], residue_ids[pairs[:, 1]]
+    same_chain = chain_i == chain_j
 
-        # Exclude directly sequential residues in the same chain for all atoms
-        if chain_i == chain_j and abs(res_i - res_j) == 1:
-            continue
+    # Exclude clashes within the same residue
+    valid = ~(same_chain & (res_i == res_j))
 
-        # If calculating sidechain clashes, only consider clashes between different chains
-        if not only_ca and chain_i == chain_j:
-            continue
+    # Exclude directly sequential residues in the same chain for all atoms
+    valid &= ~(same_chain & (np.abs(res_i - res_j) == 1))
 
-        valid_pairs.add((i, j))
+    # If calculating sidechain clashes, only consider clashes between different chains
+    if not only_ca:
+        valid &= ~same_chain
 
-    return len(valid_pairs)
+    return int(np.count_nonzero(valid))
 
 three_to_one_map = {
     'ALA': 'A', 'CYS': 'C', 'ASP': 'D', 'GLU': 'E', 'PHE': 'F',
@@ -135,10 +154,11 @@ three_to_one_map = {
 }
 
 # identify interacting residues at the binder interface
-def hotspot_residues(trajectory_pdb, binder_chain="B", atom_distance_cutoff=4.0):
-    # Parse the PDB file
-    parser = PDBParser(QUIET=True)
-    structure = parser.get_structure("complex", trajectory_pdb)
+def hotspot_residues(trajectory_pdb, binder_chain="B", atom_distance_cutoff=4.0, structure=None):
+    # Parse the PDB file, unless the caller already holds a parsed structure
+    if structure is None:
+        parser = PDBParser(QUIET=True)
+        structure = parser.get_structure("complex", trajectory_pdb)
 
     # Get the specified chain
     binder_atoms = Selection.unfold_entities(structure[0][binder_chain], 'A')
@@ -148,27 +168,25 @@ def hotspot_residues(trajectory_pdb, binder_chain="B", atom_distance_cutoff=4.0)
     target_atoms = Selection.unfold_entities(structure[0]['A'], 'A')
     target_coords = np.array([atom.coord for atom in target_atoms])
 
-    # Build KD trees for both chains
-    binder_tree = cKDTree(binder_coords)
+    # Build one KD tree over the target atoms and query it with all binder
+    # atom coordinates in a single vectorised call
     target_tree = cKDTree(target_coords)
+    pairs = target_tree.query_ball_point(binder_coords, atom_distance_cutoff)
 
     # Prepare to collect interacting residues
     interacting_residues = {}
 
-    # Query the tree for pairs of atoms within the distance cutoff
-    pairs = binder_tree.query_ball_tree(target_tree, atom_distance_cutoff)
-
     # Process each binder atom's interactions
     for binder_idx, close_indices in enumerate(pairs):
+        # only binder atoms with at least one target atom within the cutoff count
+        if not close_indices:
+            continue
         binder_residue = binder_atoms[binder_idx].get_parent()
         binder_resname = binder_residue.get_resname()
 
         # Convert three-letter code to single-letter code using the manual dictionary
         if binder_resname in three_to_one_map:
-            aa_single_letter = three_to_one_map[binder_resname]
-            for close_idx in close_indices:
-                target_residue = target_atoms[close_idx].get_parent()
-                interacting_residues[binder_residue.id[1]] = aa_single_letter
+            interacting_residues[binder_residue.id[1]] = three_to_one_map[binder_resname]
 
     return interacting_residues
 
@@ -188,9 +206,10 @@ def calc_ss_percentage(pdb_file, advanced_settings, chain_id="B", atom_distance_
     plddts_interface = []
     plddts_ss = []
 
-    # Get chain and interacting residues once
+    # Get chain and interacting residues once, reusing the parsed structure
+    # instead of parsing the same PDB a second time
     chain = model[chain_id]
-    interacting_residues = set(hotspot_residues(pdb_file, chain_id, atom_distance_cutoff).keys())
+    interacting_residues = set(hotspot_residues(pdb_file, chain_id, atom_distance_cutoff, structure=structure).keys())
 
     for residue in chain:
         residue_id = residue.id[1]
@@ -3,6 +3,7 @@
 ####################################
 ### Import dependencies
 import os, re, shutil, math, pickle
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import numpy as np
 import jax
@@ -15,8 +16,23 @@ from colabdesign.af.loss import get_ptm, mask_loss, get_dgram_bins, _get_con_los
 from colabdesign.shared.utils import copy_dict
 from .biopython_utils import hotspot_residues, calculate_clash_score, calc_ss_percentage, calculate_percentages
 from .pyrosetta_utils import pr_relax, align_pdbs
+from .pyrosetta_pool import get_pyrosetta_pool
 from .generic_utils import update_failures
 
+# lazily forked pool of relax workers, each inherits the initialised PyRosetta
+# of the main process so FastRelax can run off the GPU-bound main loop
+_relax_pool = None
+
+def _get_relax_pool(advanced_settings):
+    global _relax_pool
+    # prefer the shared pre-initialised PyRosetta pool if the driver started one
+    shared_pool = get_pyrosetta_pool()
+    if shared_pool is not None:
+        return shared_pool
+    if _relax_pool is None:
+        _relax_pool = ProcessPoolExecutor(max_workers=advanced_settings.get("relax_workers", 2))
+    return _relax_pool
+
 # hallucinate a binder
 def binder_hallucination(design_name, starting_pdb, chain, target_hotspot_residues, length, seed, helicity_value, design_models, advanced_settings, design_paths, failure_csv):
     model_pdb_path = os.path.join(design_paths["Trajectory"], design_name+".pdb")
@@ -292,16 +308,22 @@ def predict_binder_complex(prediction_model, binder_sequence, mpnn_design_name,
     if filter_failures:
         update_failures(failure_csv, filter_failures)
 
-    # AF2 filters passed, contuing with relaxation
+    # AF2 filters passed, contuing with relaxation, models are relaxed in
+    # parallel worker processes so the CPU-bound FastRelax calls overlap
+    relax_futures = []
     for model_num in prediction_models:
         complex_pdb = os.path.join(design_paths["MPNN"], f"{mpnn_design_name}_model{model_num+1}.pdb")
         if pass_af2_filters:
             mpnn_relaxed = os.path.join(design_paths["MPNN/Relaxed"], f"{mpnn_design_name}_model{model_num+1}.pdb")
-            pr_relax(complex_pdb, mpnn_relaxed)
+            relax_futures.append(_get_relax_pool(advanced_settings).submit(pr_relax, complex_pdb, mpnn_relaxed))
         else:
             if os.path.exists(complex_pdb):
                 os.remove(complex_pdb)
 
+    # join before downstream scoring reads the relaxed PDBs
+    for relax_future in relax_futures:
+        relax_future.result()
+
     return prediction_stats, pass_af2_filters
 
 # run prediction for binder alone
@@ -356,8 +378,13 @@ def mpnn_gen_sequence(trajectory_pdb, binder_chain, trajectory_interface_residue
     # prepare inputs for MPNN
     mpnn_model.prep_inputs(pdb_filename=trajectory_pdb, chain=design_chains, fix_pos=fixed_positions, rm_aa=advanced_settings["omit_AAs"])
 
-    # sample MPNN sequences in parallel
-    mpnn_sequences = mpnn_model.sample(temperature=advanced_settings["sampling_temp"], num=advanced_settings["num_seqs"], batch=advanced_settings["num_seqs"])
+    # sample MPNN sequences in parallel, the sampling softmax over 20 tokens
+    # tolerates low precision, so run the matmuls in bfloat16 unless disabled
+    if advanced_settings.get("mpnn_bf16", True):
+        with jax.default_matmul_precision("bfloat16"):
+            mpnn_sequences = mpnn_model.sample(temperature=advanced_settings["sampling_temp"], num=advanced_settings["num_seqs"], batch=advanced_settings["num_seqs"])
+    else:
+        mpnn_sequences = mpnn_model.sample(temperature=advanced_settings["sampling_temp"], num=advanced_settings["num_seqs"], batch=advanced_settings["num_seqs"])
 
     return mpnn_sequences
 
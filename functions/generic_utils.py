@@ -3,6 +3,8 @@
 ####################################
 ### Import dependencies
 import os
+import csv
+import fcntl
 import json
 import jax
 import shutil
@@ -93,35 +95,39 @@ def generate_filter_pass_csv(failure_csv, filter_json):
 
         df.to_csv(failure_csv, index=False)
 
-# update failure rates from trajectories and early predictions
+# update failure rates from trajectories and early predictions, the
+# read-modify-write is serialised through a lock file so parallel processes
+# sharing one design path do not read a half-written CSV or lose counts
 def update_failures(failure_csv, failure_column_or_dict):
-    failure_df = pd.read_csv(failure_csv)
-    
-    def strip_model_prefix(name):
-        # Strips the model-specific prefix if it exists
-        parts = name.split('_')
-        if parts[0].isdigit():
-            return '_'.join(parts[1:])
-        return name
-    
-    # update dictionary coming from complex prediction
-    if isinstance(failure_column_or_dict, dict):
-        # Update using a dictionary of failures
-        for filter_name, count in failure_column_or_dict.items():
-            stripped_name = strip_model_prefix(filter_name)
-            if stripped_name in failure_df.columns:
-                failure_df[stripped_name] += count
-            else:
-                failure_df[stripped_name] = count
-    else:
-        # Update a single column from trajectory generation
-        failure_column = strip_model_prefix(failure_column_or_dict)
-        if failure_column in failure_df.columns:
-            failure_df[failure_column] += 1
+    with open(failure_csv + '.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        failure_df = pd.read_csv(failure_csv)
+
+        def strip_model_prefix(name):
+            # Strips the model-specific prefix if it exists
+            parts = name.split('_')
+            if parts[0].isdigit():
+                return '_'.join(parts[1:])
+            return name
+
+        # update dictionary coming from complex prediction
+        if isinstance(failure_column_or_dict, dict):
+            # Update using a dictionary of failures
+            for filter_name, count in failure_column_or_dict.items():
+                stripped_name = strip_model_prefix(filter_name)
+                if stripped_name in failure_df.columns:
+                    failure_df[stripped_name] += count
+                else:
+                    failure_df[stripped_name] = count
         else:
-            failure_df[failure_column] = 1
-    
-    failure_df.to_csv(failure_csv, index=False)
+            # Update a single column from trajectory generation
+            failure_column = strip_model_prefix(failure_column_or_dict)
+            if failure_column in failure_df.columns:
+                failure_df[failure_column] += 1
+            else:
+                failure_df[failure_column] = 1
+
+        failure_df.to_csv(failure_csv, index=False)
 
 # Check if number of trajectories generated
 def check_n_trajectories(design_paths, advanced_settings):
@@ -140,42 +146,54 @@ def check_accepted_designs(design_paths, mpnn_csv, final_labels, final_csv, adva
     if len(accepted_binders) >= target_settings["number_of_final_designs"]:
         print(f"Target number {str(len(accepted_binders))} of designs reached! Reranking...")
 
-        # clear the Ranked folder in case we added new designs in the meantime so we rerank them all
-        for f in os.listdir(design_paths["Accepted/Ranked"]):
-            os.remove(os.path.join(design_paths["Accepted/Ranked"], f))
+        # serialise the rerank against parallel processes sharing one design
+        # path, two unsynchronised reranks would race on the Ranked folder
+        # and the final CSV
+        with open(final_csv + '.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
 
-        # load dataframe of designed binders
-        design_df = pd.read_csv(mpnn_csv)
-        design_df = design_df.sort_values('Average_i_pTM', ascending=False)
-        
-        # create final csv dataframe to copy matched rows, initialize with the column labels
-        final_df = pd.DataFrame(columns=final_labels)
+            # clear the Ranked folder in case we added new designs in the meantime so we rerank them all
+            for f in os.listdir(design_paths["Accepted/Ranked"]):
+                os.remove(os.path.join(design_paths["Accepted/Ranked"], f))
 
-        # check the ranking of the designs and copy them with new ranked IDs to the folder
-        rank = 1
-        for _, row in design_df.iterrows():
+            # load dataframe of designed binders
+            design_df = pd.read_csv(mpnn_csv)
+            design_df = design_df.sort_values('Average_i_pTM', ascending=False)
+
+            # map each accepted binder to its file once instead of rescanning the
+            # folder listing for every dataframe row
+            binder_files = {}
             for binder in accepted_binders:
-                target_settings["binder_name"], model = binder.rsplit('_model', 1)
-                if target_settings["binder_name"] == row['Design']:
+                binder_name, model = binder.rsplit('_model', 1)
+                binder_files.setdefault(binder_name, (binder, model))
+
+            # check the ranking of the designs and copy them with new ranked IDs to the folder
+            rank = 1
+            final_rows = []
+            for _, row in design_df.iterrows():
+                binder_match = binder_files.get(row['Design'])
+                if binder_match is not None:
+                    binder, model = binder_match
                     # rank and copy into ranked folder
-                    row_data = {'Rank': rank, **{label: row[label] for label in design_labels}}
-                    final_df = pd.concat([final_df, pd.DataFrame([row_data])], ignore_index=True)
+                    final_rows.append({'Rank': rank, **{label: row[label] for label in design_labels}})
                     old_path = os.path.join(design_paths["Accepted"], binder)
-                    new_path = os.path.join(design_paths["Accepted/Ranked"], f"{rank}_{target_settings['binder_name']}_model{model.rsplit('.', 1)[0]}.pdb")
+                    new_path = os.path.join(design_paths["Accepted/Ranked"], f"{rank}_{row['Design']}_model{model.rsplit('.', 1)[0]}.pdb")
                     shutil.copyfile(old_path, new_path)
 
                     rank += 1
-                    break
 
-        # save the final_df to final_csv
-        final_df.to_csv(final_csv, index=False)
+            # build the final dataframe in one go rather than concatenating per row
+            final_df = pd.DataFrame(final_rows, columns=final_labels)
+
+            # save the final_df to final_csv
+            final_df.to_csv(final_csv, index=False)
 
-        # zip large folders to save space
-        if advanced_settings["zip_animations"]:
-            zip_and_empty_folder(design_paths["Trajectory/Animation"], '.html')
+            # zip large folders to save space
+            if advanced_settings["zip_animations"]:
+                zip_and_empty_folder(design_paths["Trajectory/Animation"], '.html')
 
-        if advanced_settings["zip_plots"]:
-            zip_and_empty_folder(design_paths["Trajectory/Plots"], '.png')
+            if advanced_settings["zip_plots"]:
+                zip_and_empty_folder(design_paths["Trajectory/Plots"], '.png')
 
         return True
 
@@ -289,8 +307,11 @@ def create_dataframe(csv_file, columns):
 
 # insert row of statistics into csv
 def insert_data(csv_file, data_array):
-    df = pd.DataFrame([data_array])
-    df.to_csv(csv_file, mode='a', header=False, index=False)
+    # append the row directly, constructing a one-row DataFrame per insert is
+    # far more expensive; None becomes an empty field like pandas wrote NaN
+    with open(csv_file, 'a', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['' if value is None else value for value in data_array])
 
 # save generated sequence
 def save_fasta(design_name, sequence, design_paths):
@@ -299,6 +320,28 @@ def save_fasta(design_name, sequence, design_paths):
         line = f'>{design_name}\n{sequence}'
         fasta.write(line+"\n")
 
+# save all mpnn sequences of a trajectory in a single multi-record FASTA,
+# one write per trajectory instead of one file open per sequence
+def save_fasta_batch(design_name, mpnn_sequences, design_paths):
+    fasta_path = os.path.join(design_paths["MPNN/Sequences"], design_name+".fasta")
+    records = [f'>{design_name}_mpnn{n}\n{mpnn_sequence["seq"]}' for n, mpnn_sequence in enumerate(mpnn_sequences, start=1)]
+    with open(fasta_path,"w") as fasta:
+        fasta.write("\n".join(records)+"\n")
+
+# hardlink a file into place, falling back to copying across filesystems
+def link_or_copy(src, dst):
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+
+    # a hardlink is O(1) and duplicates no bytes on disk, the data is only
+    # reclaimed once the last name pointing at it is unlinked
+    try:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
 # clean unnecessary rosetta information from PDB
 def clean_pdb(pdb_file):
     # Read the pdb file and filter relevant lines
@@ -0,0 +1,50 @@
+####################################
+############ PyRosetta worker pool
+####################################
+### Import dependencies
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pyrosetta as pr
+from .pyrosetta_utils import pr_relax, score_interface
+
+# long-lived pool of worker processes, each initialises PyRosetta once at
+# start and keeps it alive for the whole run, so the CPU-bound relax and
+# interface scoring calls can run off the GPU-bound main loop without
+# re-paying pr.init per task
+_pool = None
+
+def _init_worker(init_flags):
+    # forked workers inherit the driver's initialised PyRosetta, only pay
+    # pr.init when starting from a fresh interpreter
+    if not pr.rosetta.basic.was_init_called():
+        pr.init(init_flags)
+
+# start the shared pool, workers are forked so they inherit the driver's
+# state; spawn would re-import the flat driver scripts top to bottom and
+# re-run the whole design loop in every child
+def start_pyrosetta_pool(init_flags, workers=2):
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers,
+                                    mp_context=multiprocessing.get_context("fork"),
+                                    initializer=_init_worker, initargs=(init_flags,))
+    return _pool
+
+# return the shared pool if a driver started one
+def get_pyrosetta_pool():
+    return _pool
+
+# submit a FastRelax of a PDB to the pool
+def relax_async(pdb_file, relaxed_pdb_path):
+    return _pool.submit(pr_relax, pdb_file, relaxed_pdb_path)
+
+# submit interface scoring of a relaxed PDB to the pool
+def score_interface_async(pdb_file, binder_chain="B"):
+    return _pool.submit(score_interface, pdb_file, binder_chain)
+
+def shutdown_pyrosetta_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -0,0 +1,298 @@
+#!/bin/bash
+################## BindCraft Installation Script for Kaggle (unified)
+
+# This script installs BindCraft dependencies into a prefix-based Micromamba
+# environment, with conditional support for CUDA-enabled GPU acceleration.
+# It replaces the previous pair of near-duplicate installers: the env prefix
+# (/tmp for ephemeral installs, /kaggle/working for persistent ones) and the
+# JAX version are now command-line parameters, so every optimization only has
+# to be applied once.
+#
+# Usage: ./install.sh [--prefix <dir>] [--jax <version>] [--cuda <version>]
+
+################## Configuration
+
+# abort if any step of a download pipeline fails
+set -o pipefail
+
+MICROMAMBA_DIR="/tmp/micromamba"
+ENV_DIR="/tmp/bindcraft_env"
+JAX_VERSION="latest"
+CUDA_VERSION=""
+
+# Parse command-line arguments
+while [[ "$#" -gt 0 ]]; do
+    case $1 in
+        --prefix)
+            ENV_DIR="$2"
+            shift 2
+            ;;
+        --jax)
+            JAX_VERSION="$2"
+            shift 2
+            ;;
+        --cuda)
+            CUDA_VERSION="$2"
+            shift 2
+            ;;
+        *)
+            echo "Unknown parameter passed: $1"
+            echo "Usage: $0 [--prefix <dir>] [--jax <version>] [--cuda <version>]"
+            exit 1
+            ;;
+    esac
+done
+
+PARAMS_SYMLINK_DIR="${ENV_DIR}/params"
+# keep the weights next to the env prefix: /tmp/alphafold for ephemeral
+# installs, /kaggle/working/alphafold for persistent ones
+WEIGHTS_STORAGE_DIR="$(dirname "$ENV_DIR")/alphafold"
+
+# per-JAX-version dependency matrix: the latest release takes its dependent
+# libraries from conda-forge, the pinned release installs versions known to be
+# compatible via pip in the same resolver pass as jax/jaxlib
+case "$JAX_VERSION" in
+    latest)
+        BASE_PACKAGES=(
+            python=3.10 pip pandas matplotlib "numpy<2.0.0" biopython scipy pdbfixer
+            seaborn libgfortran5 tqdm jupyter ffmpeg fsspec py3dmol chex
+            dm-haiku flax="0.9.0" dm-tree joblib ml-collections immutabledict optax
+        )
+        JAX_PINS=()
+        ;;
+    0.4.25)
+        BASE_PACKAGES=(
+            python=3.10 pip pandas matplotlib "numpy<2.0.0" biopython scipy pdbfixer
+            seaborn libgfortran5 tqdm jupyter ffmpeg fsspec py3dmol dm-haiku
+        )
+        JAX_PINS=(chex==0.1.81 flax==0.7.5 optax==0.1.7 orbax-checkpoint==0.2.4 ml-dtypes==0.4.0)
+        ;;
+    *)
+        echo "Unsupported JAX version: $JAX_VERSION (supported: latest, 0.4.25)"
+        exit 1
+        ;;
+esac
+
+################## Step 1: Install Micromamba
+if [ -x "$MICROMAMBA_DIR/micromamba" ]; then
+    echo "Micromamba already installed, skipping download."
+else
+    echo "Installing Micromamba..."
+    wget -qO micromamba.tar.bz2 https://micro.mamba.pm/api/micromamba/linux-64/latest || exit 1
+    tar -xjf micromamba.tar.bz2 bin/micromamba || exit 1
+    chmod +x bin/micromamba || exit 1
+    mkdir -p $MICROMAMBA_DIR || exit 1
+    mv bin/micromamba $MICROMAMBA_DIR/micromamba || exit 1
+    rm -rf micromamba.tar.bz2 bin
+    echo "Micromamba installed at $MICROMAMBA_DIR/micromamba"
+fi
+
+################## Start AlphaFold2 Weights Download in the Background
+# the weights download is network-bound and independent of the conda solve,
+# so run it concurrently with Steps 2-4 and collect it in Step 5
+download_alphafold_weights() {
+    mkdir -p "$WEIGHTS_STORAGE_DIR" || return 1
+    # skip the ~4 GB download if a previous run on persistent storage
+    # finished extracting the weights
+    if [ -f "$WEIGHTS_STORAGE_DIR/.extracted" ] && [ -n "$(ls -A "$WEIGHTS_STORAGE_DIR"/*.npz 2>/dev/null)" ]; then
+        echo "AlphaFold2 weights already cached, skipping download."
+        return 0
+    fi
+    # a zstd-recompressed mirror (produced once with "zstd -T0 -19 --long=27",
+    # ~1.3-1.5x smaller than the uncompressed upstream tar) wins when the
+    # download is bandwidth-bound; decompression overlaps extraction in the pipe
+    if [ -n "${AF_PARAMS_ZST_URL:-}" ]; then
+        if curl --fail --retry 5 --retry-delay 2 -sSL "$AF_PARAMS_ZST_URL" \
+                | zstd -d -T0 --long=27 | tar -x -C "$WEIGHTS_STORAGE_DIR"; then
+            touch "$WEIGHTS_STORAGE_DIR/.extracted"
+            return 0
+        fi
+        echo "Warning: zstd mirror download failed, falling back to upstream tar."
+    fi
+    local PARAMS_URL="https://storage.googleapis.com/alphafold/alphafold_params_2022-12-06.tar"
+    local PARAMS_TAR="$WEIGHTS_STORAGE_DIR/alphafold_params.tar"
+    # download with resume support (-c / -C -) so a kernel restart
+    # mid-download continues instead of refetching from byte 0
+    if command -v aria2c &> /dev/null; then
+        # multi-connection download saturates the link far beyond a single TCP stream
+        aria2c -q -c -x16 -s16 -k10M -d "$WEIGHTS_STORAGE_DIR" -o "alphafold_params.tar" "$PARAMS_URL" || return 1
+    else
+        curl --fail --retry 10 --retry-delay 5 -C - -o "$PARAMS_TAR" "$PARAMS_URL" || return 1
+    fi
+    # verify the tarball before the expensive extraction if a pinned hash was
+    # provided, catching truncated or corrupted downloads early
+    if [ -n "${AF_PARAMS_SHA256:-}" ]; then
+        echo "${AF_PARAMS_SHA256}  $PARAMS_TAR" | sha256sum -c - || return 1
+    fi
+    tar -xf "$PARAMS_TAR" -C "$WEIGHTS_STORAGE_DIR" || return 1
+    rm "$PARAMS_TAR"
+    touch "$WEIGHTS_STORAGE_DIR/.extracted"
+}
+
+echo "Starting AlphaFold weights download in the background..."
+download_alphafold_weights &
+AF_DOWNLOAD_PID=$!
+
+################## Step 2: Create Conda Environment
+# tune micromamba: no low-speed abort on flaky Kaggle links, parallel package
+# download/extraction, and only linux-64 repodata (Kaggle never needs another subdir)
+export MAMBA_NO_LOW_SPEED_LIMIT=1
+export MAMBA_EXTRACT_THREADS=$(nproc)
+export CONDA_SUBDIR=linux-64
+export CONDA_DOWNLOAD_THREADS=$(nproc)
+export CONDA_VERIFY_THREADS=$(nproc)
+
+# fastest path: unpack a prebuilt conda-pack image of the solved env, turning
+# solve + N package downloads + N extractions into one streamed decompression.
+# Point BINDCRAFT_ENV_PACK_URL at a tarball produced once with
+# "conda pack -p $ENV_DIR --format tar.zst -j $(nproc)"
+ENV_FROM_PACK=false
+if [ -n "${BINDCRAFT_ENV_PACK_URL:-}" ]; then
+    echo "Unpacking prebuilt environment from $BINDCRAFT_ENV_PACK_URL..."
+    mkdir -p "$ENV_DIR"
+    if curl --fail --retry 5 --retry-delay 2 -sSL "$BINDCRAFT_ENV_PACK_URL" \
+            | zstd -d --long=27 -T0 | tar -x -C "$ENV_DIR"; then
+        "$ENV_DIR/bin/conda-unpack" || exit 1
+        ENV_FROM_PACK=true
+        echo "Prebuilt environment unpacked."
+    else
+        echo "Warning: env pack download failed, falling back to solver install."
+        rm -rf "$ENV_DIR"
+    fi
+fi
+
+if [ -n "$CUDA_VERSION" ]; then
+    echo "CUDA version specified: $CUDA_VERSION"
+    CUDA_PACKAGES=(cuda-nvcc cudnn)
+else
+    echo "No CUDA version specified. CPU-only installation."
+    CUDA_PACKAGES=()
+fi
+
+ALL_PACKAGES=("${BASE_PACKAGES[@]}" "${CUDA_PACKAGES[@]}")
+
+# an explicit spec file (generated once from a solved env with
+# "micromamba env export --explicit -p $ENV_DIR > bindcraft.lock") skips the
+# SAT solve entirely and lets micromamba download packages in parallel
+BINDCRAFT_LOCK="$(pwd)/bindcraft.lock"
+if [ "$ENV_FROM_PACK" = true ]; then
+    echo "Skipping solver install (prebuilt environment)."
+elif [ -f "$BINDCRAFT_LOCK" ] && [ -z "$CUDA_VERSION" ]; then
+    echo "Installing from explicit spec file $BINDCRAFT_LOCK, skipping solver..."
+    $MICROMAMBA_DIR/micromamba create -y -p "$ENV_DIR" --platform=linux-64 --file "$BINDCRAFT_LOCK" || exit 1
+else
+    echo "Creating Conda environment at $ENV_DIR..."
+    # no graylab channel here: nothing in the spec comes from it and its slow
+    # repodata servers would sit on the critical path of the solve
+    $MICROMAMBA_DIR/micromamba create -y \
+        -p "$ENV_DIR" \
+        --platform=linux-64 \
+        --strict-channel-priority \
+        -c conda-forge -c nvidia \
+        "${ALL_PACKAGES[@]}" || exit 1
+fi
+
+################## Step 3: Install JAX via pip
+echo "Installing JAX..."
+# activate the environment once; every "micromamba run" otherwise re-resolves
+# the prefix and forks a fresh activation shell per command
+export MAMBA_ROOT_PREFIX="$MICROMAMBA_DIR"
+eval "$($MICROMAMBA_DIR/micromamba shell hook -s bash)"
+micromamba activate "$ENV_DIR" || exit 1
+
+if [ "$ENV_FROM_PACK" = true ]; then
+    echo "JAX and ColabDesign ship inside the prebuilt environment, skipping pip installs."
+else
+
+# prefer uv for the pip steps: parallel metadata fetches, downloads and wheel
+# extraction make cold installs several times faster; fall back to plain pip
+if pip install -q uv; then
+    # uv skips bytecode compilation by default
+    PIP_INSTALL=(uv pip install --python "$ENV_DIR/bin/python")
+else
+    # defer bytecode compilation to a single parallel compileall pass below
+    PIP_INSTALL=(pip install --no-compile)
+fi
+
+# the pinned dependent libraries go through the same resolver pass as
+# jax/jaxlib so a second install cannot silently upgrade jax and the PyPI
+# index is only resolved once
+if [ "$JAX_VERSION" = "latest" ]; then
+    if [ -n "$CUDA_VERSION" ]; then
+        CUDA_MAJOR_VERSION=$(echo "$CUDA_VERSION" | cut -d. -f1)
+        "${PIP_INSTALL[@]}" --upgrade "jax[cuda${CUDA_MAJOR_VERSION}]" -f https://storage.googleapis.com/jax-releases/jax_cuda_releases.html || exit 1
+    else
+        "${PIP_INSTALL[@]}" --upgrade jax jaxlib || exit 1
+    fi
+else
+    if [ -n "$CUDA_VERSION" ]; then
+        CUDA_MAJOR_VERSION=$(echo "$CUDA_VERSION" | cut -d. -f1)
+        if [ "$CUDA_MAJOR_VERSION" -eq 11 ]; then
+            JAXLIB_SUFFIX="cuda11.cudnn86"
+        else
+            JAXLIB_SUFFIX="cuda12.cudnn89"
+        fi
+        "${PIP_INSTALL[@]}" "jax==${JAX_VERSION}" "jaxlib==${JAX_VERSION}+${JAXLIB_SUFFIX}" "${JAX_PINS[@]}" \
+            -f https://storage.googleapis.com/jax-releases/jax_cuda_releases.html || exit 1
+    else
+        "${PIP_INSTALL[@]}" "jax==${JAX_VERSION}" "jaxlib==${JAX_VERSION}" "${JAX_PINS[@]}" || exit 1
+    fi
+fi
+
+# verify from package metadata only, avoiding the heavy eager jax import and
+# the GPU driver enumeration a jax.devices() probe would trigger
+python -c "from importlib.metadata import version; print('jax', version('jax'), 'jaxlib', version('jaxlib'))" || exit 1
+echo "JAX installed."
+
+################## Step 4: Install ColabDesign
+echo "Installing ColabDesign..."
+"${PIP_INSTALL[@]}" git+https://github.com/sokrypton/ColabDesign.git --no-deps || exit 1
+python -c "import colabdesign" || exit 1
+echo "ColabDesign installed."
+
+# byte-compile everything pip left uncompiled in one parallel pass
+echo "Byte-compiling site-packages..."
+python -m compileall -j 0 -q "$ENV_DIR/lib/python3.10/site-packages" || echo "Warning: byte-compilation failed."
+
+fi
+
+################## Step 5: Collect AlphaFold2 Weights and Create Symlinks
+echo "Handling AlphaFold2 weights..."
+mkdir -p "$PARAMS_SYMLINK_DIR" || exit 1
+
+echo "Waiting for background AlphaFold weights download..."
+wait "$AF_DOWNLOAD_PID" || { echo "Error: AlphaFold weights download failed."; exit 1; }
+
+echo "Linking weights into $PARAMS_SYMLINK_DIR..."
+# hardlink where possible: no readlink indirection on the weight-loading hot
+# path; fall back to symlinks if the two dirs ever end up on different filesystems
+ln -ft "$PARAMS_SYMLINK_DIR" "$WEIGHTS_STORAGE_DIR"/*.npz 2>/dev/null \
+    || ln -sft "$PARAMS_SYMLINK_DIR" "$WEIGHTS_STORAGE_DIR"/*.npz || exit 1
+echo "AlphaFold weights linked."
+
+################## Step 6: Adjust Permissions
+echo "Setting executable permissions..."
+# only fork chmod when the bit is actually missing; no-op on re-runs
+for f in dssp DAlphaBall.gcc; do
+    [ -x "$(pwd)/functions/$f" ] || chmod +x "$(pwd)/functions/$f" 2>/dev/null || echo "$f not found"
+done
+
+################## Step 7: Clean Up
+# cleaning the package cache is dead work when the whole prefix lives on
+# ephemeral /tmp storage that is discarded at VM teardown; for persistent
+# prefixes it frees space but nothing later depends on it, so do not block
+case "$ENV_DIR" in
+    /tmp/*)
+        echo "Skipping Micromamba cache clean (ephemeral /tmp environment)."
+        ;;
+    *)
+        echo "Cleaning Micromamba cache in the background..."
+        $MICROMAMBA_DIR/micromamba clean -a -y > /dev/null 2>&1 &
+        ;;
+esac
+
+################## Done
+t=$SECONDS
+echo "✔️ BindCraft installation complete!"
+echo "⏱️ Took $(($t / 3600))h $((($t / 60) % 60))m $(($t % 60))s"
+echo "📦 Environment installed in $ENV_DIR"
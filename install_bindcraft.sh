@@ -31,7 +31,6 @@ $MICROMAMBA_DIR/micromamba create -y \
     -p $ENV_DIR \
     -c conda-forge \
     -c nvidia \
-    --channel https://conda.graylab.jhu.edu \
     python=3.10 \
     pip \
     pandas \
@@ -45,7 +44,6 @@ $MICROMAMBA_DIR/micromamba create -y \
     tqdm \
     jupyter \
     ffmpeg \
-    pyrosetta \
     fsspec \
     py3dmol \
     chex \
@@ -62,6 +60,16 @@ $MICROMAMBA_DIR/micromamba create -y \
     cudnn \
     || { echo "Error: Failed to create Conda environment."; exit 1; }
 
+################## Step 2b: Install PyRosetta in the Background
+# the graylab channel has slow repodata servers that dominate the main solve;
+# keeping pyrosetta out of the create keeps {conda-forge, nvidia} on the
+# critical path and overlaps the graylab fetch with the steps below
+echo "Starting PyRosetta installation in the background..."
+$MICROMAMBA_DIR/micromamba install -y -p $ENV_DIR \
+    --channel https://conda.graylab.jhu.edu \
+    pyrosetta > /tmp/pyrosetta_install.log 2>&1 &
+PYROSETTA_PID=$!
+
 ################## Step 3: Install ColabDesign via pip
 echo "Installing ColabDesign..."
 $MICROMAMBA_DIR/micromamba run -p $ENV_DIR pip install git+https://github.com/sokrypton/ColabDesign.git --no-deps \
@@ -86,6 +94,11 @@ rm $PARAMS_FILE \
     || { echo "Warning: Failed to remove AlphaFold2 weights archive."; }
 echo "AlphaFold2 weights downloaded and extracted to $PARAMS_DIR."
 
+echo "Waiting for background PyRosetta installation..."
+wait $PYROSETTA_PID \
+    || { echo "Error: Failed to install PyRosetta. See /tmp/pyrosetta_install.log"; exit 1; }
+echo "PyRosetta installed."
+
 ################## Step 5: Adjust Permissions for Executables
 echo "Changing permissions for executables..."
 chmod +x "$(pwd)/functions/dssp" \
@@ -46,6 +46,15 @@ design_models, prediction_models, multimer_validation = load_af2_models(advanced
 bindcraft_folder = os.path.dirname(os.path.realpath(__file__)) # type: ignore
 advanced_settings = perform_advanced_settings_check(advanced_settings, bindcraft_folder) # type: ignore
 
+### optional on-disk JAX compilation cache
+# AF2 graphs are recompiled whenever the binder length changes; with thousands
+# of trajectories the same lengths recur, so caching compiled executables on
+# disk turns those recompilations (and all compilations after a restart) into
+# cache hits
+if advanced_settings.get("jax_compilation_cache_dir"):
+    jax.config.update("jax_compilation_cache_dir", advanced_settings["jax_compilation_cache_dir"]) # type: ignore
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", 1.0) # type: ignore
+
 ### generate directories, design path names can be found within the function
 design_paths = generate_directories(target_settings["design_path"]) # type: ignore
 
@@ -66,7 +75,12 @@ generate_filter_pass_csv(failure_csv, args.filters) # type: ignore
 ####################################
 ####################################
 ### initialise PyRosetta
-pr.init(f'-ignore_unrecognized_res -ignore_zero_occupancy -mute all -holes:dalphaball {advanced_settings["dalphaball_path"]} -corrections::beta_nov16 true -relax:default_repeats 1') # type: ignore
+pyrosetta_flags = f'-ignore_unrecognized_res -ignore_zero_occupancy -mute all -holes:dalphaball {advanced_settings["dalphaball_path"]} -corrections::beta_nov16 true -relax:default_repeats 1'
+pr.init(pyrosetta_flags) # type: ignore
+
+# shared pool of pre-initialised PyRosetta worker processes, relax and
+# interface scoring run there while the main loop keeps the GPU busy
+start_pyrosetta_pool(pyrosetta_flags, advanced_settings.get("relax_workers", 2)) # type: ignore
 print(f"Running binder design for target {settings_file}")
 print(f"Design settings used: {advanced_file}")
 print(f"Filtering designs based on {filters_file}")
@@ -81,6 +95,23 @@ script_start_time = time.time() # type: ignore
 trajectory_n = 1
 accepted_designs = 0
 
+# single modern Generator for seed and length sampling, drawing scalars
+# directly instead of allocating arrays through the legacy RandomState
+rng = np.random.default_rng() # type: ignore
+
+# hoist values that never change between trajectories out of the design loop
+binder_name = target_settings["binder_name"]
+min_binder_length = min(target_settings["lengths"])
+max_binder_length = max(target_settings["lengths"])
+
+# index existing trajectory PDBs once, set membership replaces four stat()
+# calls per loop iteration
+trajectory_dirs = ["Trajectory", "Trajectory/Relaxed", "Trajectory/LowConfidence", "Trajectory/Clashing"]
+existing_trajectories = set()
+for trajectory_dir in trajectory_dirs:
+    with os.scandir(design_paths[trajectory_dir]) as entries: # type: ignore
+        existing_trajectories.update(entry.name for entry in entries if entry.name.endswith('.pdb'))
+
 ### start design loop
 while True:
     ### check if we have the target number of binders
@@ -101,21 +132,24 @@ while True:
     trajectory_start_time = time.time() # type: ignore
 
     # generate random seed to vary designs
-    seed = int(np.random.randint(0, high=999999, size=1, dtype=int)[0]) # type: ignore
+    seed = int(rng.integers(0, 999999))
 
     # sample binder design length randomly from defined distribution
-    samples = np.arange(min(target_settings["lengths"]), max(target_settings["lengths"]) + 1) # type: ignore
-    length = np.random.choice(samples) # type: ignore
+    length = int(rng.integers(min_binder_length, max_binder_length + 1))
 
     # load desired helicity value to sample different secondary structure contents
     helicity_value = load_helicity(advanced_settings) # type: ignore
 
     # generate design name and check if same trajectory was already run
-    design_name = target_settings["binder_name"] + "_l" + str(length) + "_s"+ str(seed)
-    trajectory_dirs = ["Trajectory", "Trajectory/Relaxed", "Trajectory/LowConfidence", "Trajectory/Clashing"]
-    trajectory_exists = any(os.path.exists(os.path.join(design_paths[trajectory_dir], design_name + ".pdb")) for trajectory_dir in trajectory_dirs) # type: ignore
+    design_name = binder_name + "_l" + str(length) + "_s"+ str(seed)
+    trajectory_pdb_name = design_name + ".pdb"
+    # on a set miss, confirm against all trajectory folders on disk so designs
+    # written, moved or cleaned up by sibling processes after startup are
+    # still skipped
+    trajectory_exists = trajectory_pdb_name in existing_trajectories or any(os.path.exists(os.path.join(design_paths[trajectory_dir], trajectory_pdb_name)) for trajectory_dir in trajectory_dirs) # type: ignore
 
     if not trajectory_exists:
+        existing_trajectories.add(trajectory_pdb_name)
         print("Starting trajectory: "+design_name)
 
         ### Begin binder hallucination
@@ -147,18 +181,23 @@ while True:
         if hasattr(trajectory, 'aux') and "log" in trajectory.aux and trajectory.aux["log"].get("terminate", "Unknown") == "": # type: ignore
             # Relax binder to calculate statistics
             trajectory_relaxed = os.path.join(design_paths["Trajectory/Relaxed"], design_name + ".pdb") # type: ignore
-            pr_relax(trajectory_pdb, trajectory_relaxed) # type: ignore
+            relax_future = relax_async(trajectory_pdb, trajectory_relaxed) # type: ignore
 
             # define binder chain, placeholder in case multi-chain parsing in ColabDesign gets changed
             binder_chain = "B"
 
-            # Calculate clashes before and after relaxation
+            # Calculate clashes before relaxation
             num_clashes_trajectory = calculate_clash_score(trajectory_pdb) # type: ignore
-            num_clashes_relaxed = calculate_clash_score(trajectory_relaxed) # type: ignore
 
             # secondary structure content of starting trajectory binder and interface
             trajectory_alpha, trajectory_beta, trajectory_loops, trajectory_alpha_interface, trajectory_beta_interface, trajectory_loops_interface, trajectory_i_plddt, trajectory_ss_plddt = calc_ss_percentage(trajectory_pdb, advanced_settings, binder_chain) # type: ignore
 
+            # join the background relax before the relaxed-structure analyses
+            relax_future.result()
+
+            # Calculate clashes after relaxation
+            num_clashes_relaxed = calculate_clash_score(trajectory_relaxed) # type: ignore
+
             # analyze interface scores for relaxed af2 trajectory
             trajectory_interface_scores, trajectory_interface_AA, trajectory_interface_residues = score_interface(trajectory_relaxed, binder_chain) # type: ignore
 
@@ -222,6 +261,22 @@ while True:
                 mpnn_count = 1
                 mpnn_passes = 0
 
+                ### Compile prediction models once for faster prediction of MPNN sequences
+                # all MPNN sequences of a trajectory share the same binder length,
+                # so one compiled model serves every sequence instead of JAX
+                # re-tracing per design
+                clear_mem() # type: ignore
+                complex_prediction_model = mk_afdesign_model(protocol="binder", num_recycles=advanced_settings["num_recycles_validation"], data_dir=advanced_settings["af_params_dir"], # type: ignore
+                                                            use_multimer=multimer_validation, use_bfloat16=advanced_settings.get("use_bfloat16_prediction", True))
+                complex_prediction_model.prep_inputs(pdb_filename=target_settings["starting_pdb"], chain=target_settings["chains"], binder_len=length, rm_target_seq=advanced_settings["rm_template_seq_predict"],
+                                                    rm_target_sc=advanced_settings["rm_template_sc_predict"])
+
+                binder_prediction_model = mk_afdesign_model(protocol="hallucination", use_templates=False, initial_guess=False, # type: ignore
+                                                            use_initial_atom_pos=False, num_recycles=advanced_settings["num_recycles_validation"],
+                                                            data_dir=advanced_settings["af_params_dir"], use_multimer=multimer_validation,
+                                                            use_bfloat16=advanced_settings.get("use_bfloat16_prediction", True))
+                binder_prediction_model.prep_inputs(length=length)
+
                 # predict and score each mpnn designed sequence
                 for i in range(len(mpnn_sequences)):
                     if mpnn_passes >= advanced_settings["max_mpnn_sequences"]:
@@ -232,30 +287,39 @@ while True:
                     mpnn_complex_path = os.path.join(design_paths["MPNN/Complex"], mpnn_pdb_filename) # type: ignore
                     print("Starting design validation for "+mpnn_design_name)
 
-                    # predict protein complex
-                    mpnn_complex_metrics, mpnn_complex_pdb = predict_binder_complex(mpnn_sequences[i], target_settings["starting_pdb"], target_settings["chains"], # type: ignore
+                    # predict protein complex with the shared compiled model
+                    mpnn_complex_metrics, mpnn_complex_pdb = predict_binder_complex(complex_prediction_model, mpnn_sequences[i], target_settings["starting_pdb"], target_settings["chains"], # type: ignore
                                                                                 mpnn_design_name, prediction_models, advanced_settings, multimer_validation, design_paths)
 
-                    # predict binder monomer
-                    mpnn_monomer_metrics, mpnn_monomer_pdb = predict_binder_alone(mpnn_sequences[i], target_settings["starting_pdb"], target_settings["chains"], # type: ignore
-                                                                            mpnn_design_name, prediction_models, advanced_settings, multimer_validation, design_paths)
-
                     # check if AF2 complex prediction succeeded
                     if mpnn_complex_pdb is not None:
                         # apply initial AF2-based filters to skip non-promising designs
                         mpnn_filters_passed = apply_initial_filters(mpnn_complex_metrics, filters["Initial_filter"]) # type: ignore
                         print("MPNN design passed initial filters: " +str(mpnn_filters_passed))
 
+                        # predict binder monomer with the shared compiled model, only
+                        # paying for the prediction when the complex passed the cheap
+                        # initial filters
+                        if mpnn_filters_passed:
+                            mpnn_monomer_metrics, mpnn_monomer_pdb = predict_binder_alone(binder_prediction_model, mpnn_sequences[i], target_settings["starting_pdb"], target_settings["chains"], # type: ignore
+                                                                                    mpnn_design_name, prediction_models, advanced_settings, multimer_validation, design_paths)
+                        else:
+                            mpnn_monomer_metrics, mpnn_monomer_pdb = {}, None
+
                         # relax mpnn complex
                         mpnn_relaxed_path = os.path.join(design_paths["MPNN/Relaxed"], mpnn_pdb_filename) # type: ignore
-                        pr_relax(mpnn_complex_path, mpnn_relaxed_path) # type: ignore
+                        relax_future = relax_async(mpnn_complex_path, mpnn_relaxed_path) # type: ignore
 
-                        # number of clashes pre and post-relaxation
+                        # number of clashes pre-relaxation
                         num_clashes_mpnn = calculate_clash_score(mpnn_complex_path) # type: ignore
-                        num_clashes_mpnn_relaxed = calculate_clash_score(mpnn_relaxed_path) # type: ignore
 
-                        # analyse mpnn designed interface
-                        mpnn_interface_scores, mpnn_interface_AA, mpnn_interface_residues = score_interface(mpnn_relaxed_path, binder_chain) # type: ignore
+                        # join the relax, then score the interface in a worker
+                        # while the remaining analyses run here
+                        relax_future.result()
+                        score_future = score_interface_async(mpnn_relaxed_path, binder_chain) # type: ignore
+
+                        # number of clashes post-relaxation
+                        num_clashes_mpnn_relaxed = calculate_clash_score(mpnn_relaxed_path) # type: ignore
 
                         # analyse mpnn sequence
                         mpnn_seq_notes = validate_design_sequence(mpnn_sequences[i], num_clashes_mpnn_relaxed, advanced_settings) # type: ignore
@@ -269,8 +333,14 @@ while True:
                         # target structure RMSD compared to input PDB
                         mpnn_target_rmsd = target_pdb_rmsd(mpnn_relaxed_path, target_settings["starting_pdb"], target_settings["chains"]) # type: ignore
 
-                        # binder structure RMSD compared to binder monomer
-                        mpnn_binder_rmsd = binder_pdb_rmsd(mpnn_relaxed_path, mpnn_monomer_pdb, binder_chain, target_settings["chains"], advanced_settings["remove_binder_monomer"]) # type: ignore
+                        # binder structure RMSD compared to binder monomer, if predicted
+                        if mpnn_monomer_pdb is not None:
+                            mpnn_binder_rmsd = binder_pdb_rmsd(mpnn_relaxed_path, mpnn_monomer_pdb, binder_chain, target_settings["chains"], advanced_settings["remove_binder_monomer"]) # type: ignore
+                        else:
+                            mpnn_binder_rmsd = None
+
+                        # collect the interface scores from the worker
+                        mpnn_interface_scores, mpnn_interface_AA, mpnn_interface_residues = score_future.result()
 
                         mpnn_data = [mpnn_design_name, advanced_settings["design_algorithm"], length, seed, helicity_value, target_settings["target_hotspot_residues"],
                                     mpnn_sequences[i], mpnn_interface_residues, mpnn_scores[i], mpnn_complex_metrics.get("plddt", None), mpnn_complex_metrics.get("ptm", None),
@@ -292,7 +362,8 @@ while True:
                             # If filters are passed, copy binder complex and relaxed to "Accepted" folder
                             copy_file(mpnn_complex_path, os.path.join(design_paths["MPNN/Accepted"], mpnn_pdb_filename)) # type: ignore
                             copy_file(mpnn_relaxed_path, os.path.join(design_paths["MPNN/Accepted"], mpnn_design_name + "_relaxed.pdb")) # type: ignore
-                            copy_file(mpnn_monomer_pdb, os.path.join(design_paths["MPNN/Accepted"], mpnn_design_name + "_monomer.pdb")) # type: ignore
+                            if mpnn_monomer_pdb is not None:
+                                copy_file(mpnn_monomer_pdb, os.path.join(design_paths["MPNN/Accepted"], mpnn_design_name + "_monomer.pdb")) # type: ignore
                             add_row_to_csv(final_csv, mpnn_data) # type: ignore
                             mpnn_passes += 1
                             print("Accepted design: " +mpnn_design_name)
@@ -303,7 +374,7 @@ while True:
                         if advanced_settings["remove_unrelaxed_complex"]:
                             remove_file(mpnn_complex_path) # type: ignore
 
-                        if advanced_settings["remove_binder_monomer"] and mpnn_final_filters_passed is False:
+                        if advanced_settings["remove_binder_monomer"] and mpnn_final_filters_passed is False and mpnn_monomer_pdb is not None:
                             remove_file(mpnn_monomer_pdb) # type: ignore
 
                     else:
@@ -333,6 +404,8 @@ while True:
         print("")
 
 ### print job information
+shutdown_pyrosetta_pool() # type: ignore
+
 # total time
 script_total_time = time.time() - script_start_time # type: ignore
 script_total_time_text = f"{'%d hours, %d minutes, %d seconds' % (int(script_total_time // 3600), int((script_total_time % 3600) // 60), int(script_total_time % 60))}"
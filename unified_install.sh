@@ -122,9 +122,7 @@ tar -xf "$ARCHIVE" -C "$WEIGHTS_DIR"
 rm "$ARCHIVE"
 
 echo "🔗 Creating symlinks in $SYMLINK_DIR"
-for f in "$WEIGHTS_DIR"/*; do
-  ln -sf "$f" "$SYMLINK_DIR"/
-done
+ln -sft "$SYMLINK_DIR" "$WEIGHTS_DIR"/*
 
 ######################### Set executable permissions ##########################
 chmod +x "$(pwd)/functions/dssp"           2>/dev/null || true